@@ -11,7 +11,7 @@ echo 🚀 Installing advanced processing packages...
 echo.
 
 REM Install video/audio processing packages
-py -m pip install moviepy SpeechRecognition psutil
+py -m pip install imageio-ffmpeg SpeechRecognition psutil
 
 echo.
 echo ================================================================
@@ -6,23 +6,46 @@ Case: FDSJ-739-24 - Comprehensive Multi-Format Evidence Processing
 
 import os
 import csv
+import hashlib
 import subprocess
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Attempt to import necessary libraries (user must install them)
 try:
-    from pydub import AudioSegment
-    import moviepy.editor as mp
     import speech_recognition as sr
-    from pdfminer.high_level import extract_text_from_file
+    from pdfminer.high_level import extract_text
     from docx import Document
     ADVANCED_LIBS_AVAILABLE = True
 except ImportError:
     ADVANCED_LIBS_AVAILABLE = False
+
+# PDFium skips pdfminer's layout analysis - much faster for plain text extraction
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# Aho-Corasick matches every keyword in a single pass over the text
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# imageio-ffmpeg ships a static ffmpeg binary; fall back to one on PATH
+try:
+    import imageio_ffmpeg
+    FFMPEG_EXE = imageio_ffmpeg.get_ffmpeg_exe()
+except (ImportError, RuntimeError):
+    FFMPEG_EXE = "ffmpeg"
     
 # Import config settings (assuming config/settings.py is present)
 try:
@@ -33,24 +56,75 @@ except ImportError:
     relevance_codes = {'GENERAL': ['harper']}
     priority_weights = {'GENERAL': 1}
 
+# Flattens line breaks (including Windows \r\n) in the CSV text preview in a single pass
+NEWLINE_TO_SPACE = str.maketrans('\r\n', '  ')
+
+# Bump when an extractor changes so stale cached text is not reused
+EXTRACT_CACHE_VERSION = 1
+PDF_EXTRACTOR_TAG = 'pdfium' if PDFIUM_AVAILABLE else 'pdfminer'
+
+# Long recordings are split into chunks and recognized concurrently
+TRANSCRIPTION_CHUNK_MS = 30000
+TRANSCRIPTION_SAMPLE_RATE = 16000  # Google STT's native rate, no further resampling needed
+TRANSCRIPTION_WORKERS = 8
+STT_MAX_CONCURRENT_REQUESTS = 8  # Google STT throttles by QPS; shared by every pool process
+
+# In-flight STT request slots. init_worker swaps in one semaphore shared by the whole process pool.
+_stt_request_slots = threading.BoundedSemaphore(STT_MAX_CONCURRENT_REQUESTS)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Categories ranked by descending priority (stable, so equal priorities keep config order).
+# The first matching category in this order is always the best match.
+RANKED_RELEVANCE_CODES = sorted(relevance_codes.items(), key=lambda item: -priority_weights.get(item[0], 1))
+
+def build_keyword_automaton():
+    """Compile all relevance keywords into one automaton mapping keyword -> (priority, rank, category)."""
+    automaton = ahocorasick.Automaton()
+    for rank, (category, keywords) in enumerate(RANKED_RELEVANCE_CODES):
+        priority = priority_weights.get(category, 1)
+        for keyword in keywords:
+            # Shared keywords keep the best-ranked category
+            if keyword and not automaton.exists(keyword):
+                automaton.add_word(keyword, (priority, rank, category))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+KEYWORD_AUTOMATON = build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+
 class AdvancedEvidenceProcessor:
+
+    FILENAME_DATE_PATTERN = re.compile(r'(\d{8})')
+    CSV_FIELDNAMES = ('filename', 'file_path', 'file_type', 'date_extracted', 'text_content', 'text_length', 'priority', 'categories', 'processing_timestamp')
     
     def __init__(self):
         self.output_folder = Path("output")
         self.input_folder = Path("custody_screenshots_smart_renamed")
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.csv_filename = self.output_folder / f"harper_advanced_results_{self.timestamp}.csv"
+        # Extracted text keyed by SHA-256 of the source file, reused across runs
+        self.extract_cache_folder = self.output_folder / ".extract_cache"
         
         if not ADVANCED_LIBS_AVAILABLE:
-            logger.warning("Missing libraries (pydub, moviepy, speech_recognition, pdfminer.six, python-docx). Multimedia processing disabled.")
+            logger.warning("Missing libraries (speech_recognition, pdfminer.six, python-docx). Multimedia processing disabled.")
 
     def extract_text_from_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF file using PDFMiner."""
+        """Extract text from PDF file using PDFium, falling back to PDFMiner."""
+        if PDFIUM_AVAILABLE:
+            try:
+                pdf = pdfium.PdfDocument(str(file_path))
+                try:
+                    return "\n".join(page.get_textpage().get_text_bounded() for page in pdf)
+                finally:
+                    pdf.close()
+            except Exception as e:
+                logger.warning(f"PDFium extraction failed for {file_path}, falling back to PDFMiner: {e}")
+
         try:
-            return extract_text_from_file(file_path)
+            return extract_text(str(file_path))
         except Exception as e:
             logger.error(f"PDF extraction failed for {file_path}: {e}")
             return ""
@@ -64,68 +138,135 @@ class AdvancedEvidenceProcessor:
             logger.error(f"DOCX extraction failed for {file_path}: {e}")
             return ""
 
+    def decode_audio(self, source_path: Path) -> "sr.AudioData":
+        """Decode any audio/video file to mono 16 kHz 16-bit PCM with one ffmpeg pass, straight into memory."""
+        result = subprocess.run(
+            [FFMPEG_EXE, "-i", str(source_path), "-vn", "-ac", "1", "-ar", str(TRANSCRIPTION_SAMPLE_RATE),
+             "-f", "s16le", "-acodec", "pcm_s16le", "-"],
+            # Pool workers run many ffmpeg at once; none of them may read the terminal
+            check=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        return sr.AudioData(result.stdout, TRANSCRIPTION_SAMPLE_RATE, 2)
+
+    def extract_text_cached(self, file_path: Path, extractor, extractor_tag: str) -> str:
+        """Run `extractor` on the file, reusing a previous result from the same extractor for identical file contents."""
+        try:
+            with open(file_path, 'rb') as f:
+                file_hash = hashlib.file_digest(f, 'sha256').hexdigest()
+        except OSError as e:
+            logger.warning(f"Could not hash {file_path} for the extraction cache: {e}")
+            return extractor(file_path)
+
+        cache_path = self.extract_cache_folder / f"{extractor_tag}-v{EXTRACT_CACHE_VERSION}-{file_hash}.txt"
+        if cache_path.is_file():
+            try:
+                with open(cache_path, 'r', encoding='utf-8', newline='') as f:
+                    return f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Ignoring unreadable extraction cache entry for {file_path}: {e}")
+
+        text = extractor(file_path)
+        if text:
+            # Write then rename so concurrent workers never read a partial entry
+            temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                self.extract_cache_folder.mkdir(parents=True, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(text)
+                os.replace(temp_path, cache_path)
+            except OSError as e:
+                # The cache is only an optimization; never fail the file over it
+                logger.warning(f"Could not cache extracted text for {file_path}: {e}")
+                try:
+                    temp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+        return text
+
     def transcribe_audio(self, file_path: Path) -> str:
         """Transcribe audio/video file using speech_recognition."""
-        
-        if file_path.suffix.lower() in ['.mp4', '.mov']:
-            # 1. Convert video to audio (MP4, MOV -> MP3)
-            logger.info(f"Converting video to audio: {file_path.name}")
-            temp_audio = Path(self.output_folder / f"temp_{file_path.stem}.mp3")
+        r = sr.Recognizer()
+        text = ""
+
+        if file_path.suffix.lower() != '.wav':
+            # 1. Decode video/compressed audio (MP4, MOV, MP3) to PCM - no temp WAV on disk
+            logger.info(f"Decoding audio: {file_path.name}")
             try:
-                clip = mp.VideoFileClip(str(file_path))
-                clip.audio.write_audiofile(str(temp_audio))
-                clip.close()
+                audio_data = self.decode_audio(file_path)
             except Exception as e:
-                logger.error(f"Video to audio conversion failed: {e}")
+                logger.error(f"Audio conversion failed for {file_path}: {e}")
                 return ""
-            audio_path = temp_audio
-        else:
-            audio_path = file_path
 
-        # 2. Transcribe audio file
-        r = sr.Recognizer()
-        text = ""
+        # 2. Transcribe audio
         try:
-            # Convert to WAV for better recognition compatibility
-            if audio_path.suffix.lower() != '.wav':
-                audio = AudioSegment.from_file(audio_path)
-                wav_path = Path(self.output_folder / f"temp_{audio_path.stem}.wav")
-                audio.export(wav_path, format="wav")
-                
-                with sr.AudioFile(str(wav_path)) as source:
-                    audio_data = r.record(source)
-                    text = r.recognize_google(audio_data)
-                os.remove(wav_path)
-            
-            elif audio_path.suffix.lower() == '.wav':
-                with sr.AudioFile(str(audio_path)) as source:
+            if file_path.suffix.lower() == '.wav':
+                with sr.AudioFile(str(file_path)) as source:
                     audio_data = r.record(source)
-                    text = r.recognize_google(audio_data)
+            text = self.recognize_in_chunks(r, audio_data)
             
         except sr.UnknownValueError:
             text = "[TRANSCRIPTION_FAILED: Could not understand audio]"
             logger.warning(f"Transcription failed for {file_path}: Audio unclear")
         except Exception as e:
             logger.error(f"Transcription error for {file_path}: {e}")
-        finally:
-            if 'temp_audio' in locals() and os.path.exists(temp_audio):
-                os.remove(temp_audio)
                 
         return text
 
-    def categorize_content(self, text: str) -> Tuple[str, str]:
-        """Categorize content with priority scoring."""
-        text_lower = text.lower()
+    def recognize_in_chunks(self, recognizer, audio_data) -> str:
+        """Recognize audio in fixed-length chunks on a thread pool and join the transcripts."""
+        bytes_per_ms = audio_data.sample_rate * audio_data.sample_width / 1000
+        duration_ms = int(len(audio_data.frame_data) / bytes_per_ms)
+        starts = range(0, duration_ms, TRANSCRIPTION_CHUNK_MS)
+
+        def recognize_chunk(start):
+            # A lost chunk stays visible in the transcript as a marker, never silently dropped
+            span = f"{start // 1000}s-{min(start + TRANSCRIPTION_CHUNK_MS, duration_ms) // 1000}s"
+            chunk = audio_data.get_segment(start, start + TRANSCRIPTION_CHUNK_MS)
+            try:
+                with _stt_request_slots:
+                    return True, recognizer.recognize_google(chunk)
+            except sr.UnknownValueError:
+                logger.warning(f"Audio unclear in segment {span}")
+                return False, f"[UNCLEAR_AUDIO: {span}]"
+            except sr.RequestError as e:
+                logger.warning(f"Speech API request failed for segment {span}: {e}")
+                return False, f"[TRANSCRIPTION_FAILED: {span}]"
+
+        with ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS) as executor:
+            results = list(executor.map(recognize_chunk, starts))
+
+        if not any(ok for ok, _ in results):
+            if any(text.startswith("[TRANSCRIPTION_FAILED") for _, text in results):
+                raise sr.RequestError("Speech API requests failed and no segment was transcribed")
+            raise sr.UnknownValueError()
+        return " ".join(text for _, text in results if text)
+
+    def categorize_content(self, text: str, text_lower: Optional[str] = None) -> Tuple[str, str]:
+        """Categorize content with priority scoring. Pass `text_lower` if the caller already lowercased the text."""
+        if text_lower is None:
+            text_lower = text.lower()
         
         best_priority = 1
         best_category = 'GENERAL_EVIDENCE'
-        
-        for category, keywords in relevance_codes.items():
+
+        if KEYWORD_AUTOMATON is not None:
+            best_rank = len(RANKED_RELEVANCE_CODES)
+            for _, (priority, rank, category) in KEYWORD_AUTOMATON.iter(text_lower):
+                if rank < best_rank and priority > 1:
+                    best_priority, best_rank, best_category = priority, rank, category
+                    if rank == 0:
+                        break  # Top-ranked category, nothing can beat it
+            return best_category, self.get_priority_label(best_priority)
+
+        # Scan in rank order and stop at the first hit
+        for category, keywords in RANKED_RELEVANCE_CODES:
+            priority = priority_weights.get(category, 1)
+            if priority <= best_priority:
+                break
             if any(keyword in text_lower for keyword in keywords):
-                priority = priority_weights.get(category, 1)
-                if priority > best_priority:
-                    best_priority = priority
-                    best_category = category
+                best_priority = priority
+                best_category = category
+                break
         
         return best_category, self.get_priority_label(best_priority)
 
@@ -139,64 +280,99 @@ class AdvancedEvidenceProcessor:
         else:
             return "LOW"
     
+    def process_file(self, file_path: Path) -> Optional[Tuple]:
+        """Extract, categorize and date a single file. Returns the CSV row tuple, or None if empty."""
+        file_type = file_path.suffix.lower()
+        text_content = ""
+
+        if file_type == '.pdf':
+            text_content = self.extract_text_cached(file_path, self.extract_text_from_pdf, PDF_EXTRACTOR_TAG)
+        elif file_type == '.docx':
+            text_content = self.extract_text_cached(file_path, self.extract_text_from_docx, 'docx')
+        elif file_type in ['.mp4', '.mov', '.mp3', '.wav']:
+            text_content = self.transcribe_audio(file_path)
+
+        if not text_content:
+            return None
+
+        text_lower = text_content.lower()
+        categories, priority = self.categorize_content(text_content, text_lower)
+
+        # Try to extract date from filename
+        date_match = self.FILENAME_DATE_PATTERN.search(file_path.name)
+        date_extracted = date_match.group(1) if date_match else "unknown"
+
+        # Row order must match CSV_FIELDNAMES
+        return (
+            file_path.name,
+            str(file_path),
+            file_type,
+            date_extracted,
+            text_content[:1000].translate(NEWLINE_TO_SPACE),
+            len(text_content),
+            priority,
+            categories,
+            datetime.now().isoformat()
+        )
+
+    def find_advanced_files(self) -> List[Path]:
+        """Walk the input folder once, keeping files with a multimedia/document extension."""
+        extensions = {ext.lower() for ext in multimedia_extensions}
+        found = []
+        # os.walk is scandir-based and only builds Path objects for matches
+        for root, _, filenames in os.walk(self.input_folder):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in extensions:
+                    found.append(Path(root) / filename)
+        return found
+
     def process_all_advanced_files(self):
         """Find and process all multimedia/document files."""
         if not ADVANCED_LIBS_AVAILABLE:
             logger.error("Cannot run advanced processing due to missing libraries.")
             return
 
-        all_files = []
-        for ext in multimedia_extensions:
-            all_files.extend(self.input_folder.rglob(f"*{ext}"))
+        all_files = self.find_advanced_files()
 
         with open(self.csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['filename', 'file_path', 'file_type', 'date_extracted', 'text_content', 'text_length', 'priority', 'categories', 'processing_timestamp']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+            writer = csv.writer(csvfile)
+            writer.writerow(self.CSV_FIELDNAMES)
             
             logger.info(f"Found {len(all_files)} advanced files to process.")
 
-            for file_path in all_files:
-                file_type = file_path.suffix.lower()
-                text_content = ""
-                
-                if file_type == '.pdf':
-                    text_content = self.extract_text_from_pdf(file_path)
-                elif file_type == '.docx':
-                    text_content = self.extract_text_from_docx(file_path)
-                elif file_type in ['.mp4', '.mov', '.mp3', '.wav']:
-                    text_content = self.transcribe_audio(file_path)
-                
-                if text_content:
-                    categories, priority = self.categorize_content(text_content)
-                    
-                    # Try to extract date from filename
-                    date_match = re.search(r'(\d{8})', file_path.name)
-                    date_extracted = date_match.group(1) if date_match else "unknown"
-
-                    writer.writerow({
-                        'filename': file_path.name,
-                        'file_path': str(file_path),
-                        'file_type': file_type,
-                        'date_extracted': date_extracted,
-                        'text_content': text_content[:1000].replace('\n', ' '),
-                        'text_length': len(text_content),
-                        'priority': priority,
-                        'categories': categories,
-                        'processing_timestamp': datetime.now().isoformat()
-                    })
-                    logger.info(f"✓ Processed {file_path.name} ({priority} | {categories})")
-                else:
-                    logger.warning(f"Skipped {file_path.name} - No content extracted.")
+            stt_request_slots = multiprocessing.BoundedSemaphore(STT_MAX_CONCURRENT_REQUESTS)
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=init_worker, initargs=(stt_request_slots,)) as executor:
+                for file_path, row in zip(all_files, executor.map(process_one, [str(p) for p in all_files], chunksize=4)):
+                    if row:
+                        writer.writerow(row)
+                        priority, categories = row[6], row[7]
+                        logger.info(f"✓ Processed {file_path.name} ({priority} | {categories})")
+                    else:
+                        logger.warning(f"Skipped {file_path.name} - No content extracted.")
 
         logger.info(f"Advanced evidence processing complete. Results saved to {self.csv_filename.name}")
 
+# Per-process processor used by the ProcessPoolExecutor workers
+_worker_processor = None
+
+def init_worker(stt_request_slots) -> None:
+    """Pool initializer: cap in-flight STT requests across all worker processes, not per process."""
+    global _stt_request_slots
+    _stt_request_slots = stt_request_slots
+
+def process_one(path_str: str) -> Optional[Tuple]:
+    """Worker entry point: process one file in a pool process (must stay top-level to be picklable)."""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = AdvancedEvidenceProcessor()
+    return _worker_processor.process_file(Path(path_str))
+
 if __name__ == "__main__":
     if not ADVANCED_LIBS_AVAILABLE:
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print("!!!  CRITICAL ERROR: MISSING PYTHON LIBRARIES  !!!")
-        print("!!!  Please install: moviepy, pydub, speech_recognition,     !!!")
-        print("!!!  pdfminer.six, python-docx (or install all with pip)     !!!")
+        print("!!!  Please install: speech_recognition, pdfminer.six,       !!!")
+        print("!!!  python-docx (or install all with pip) and ffmpeg        !!!")
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
     else:
         processor = AdvancedEvidenceProcessor()
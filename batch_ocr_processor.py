@@ -70,9 +70,12 @@ class BatchOCRProcessor:
         try:
             image = Image.open(image_path)
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # JPEGs: have libjpeg decode straight to grayscale (full size - OCR needs the resolution)
+            if image.format == 'JPEG':
+                image.draft('L', image.size)
+            
+            # Convert to grayscale for better OCR - before enhancing, so the filters touch one channel instead of three
+            image = image.convert('L')
             
             # Enhance contrast and sharpness
             enhancer = ImageEnhance.Contrast(image)
@@ -81,9 +84,6 @@ class BatchOCRProcessor:
             enhancer = ImageEnhance.Sharpness(image)
             image = enhancer.enhance(2.0)
             
-            # Convert to grayscale for better OCR
-            image = image.convert('L')
-            
             return image
             
         except Exception as e:
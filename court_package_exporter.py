@@ -15,10 +15,15 @@ from typing import Dict, List, Optional
 import logging
 import csv
 import hashlib
+import mmap
 from PIL import Image
 import sqlite3
 from utils.path_utils import ensure_long_path, safe_filename
 
+# Large evidence files are hashed straight from an mmap; smaller ones in 1 MB reads
+MMAP_HASH_THRESHOLD = 10 * 1024 * 1024
+HASH_READ_SIZE = 1024 * 1024
+
 class CourtPackageExporter:
     """Professional evidence package creation for court submission."""
     
@@ -100,8 +105,12 @@ class CourtPackageExporter:
         try:
             hash_sha256 = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
+                if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hash_sha256.update(mm)
+                else:
+                    for chunk in iter(lambda: f.read(HASH_READ_SIZE), b""):
+                        hash_sha256.update(chunk)
             return hash_sha256.hexdigest()
         except Exception as e:
             self.logger.error(f"Failed to calculate hash for {file_path}: {e}")
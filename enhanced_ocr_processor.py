@@ -16,7 +16,7 @@ import cv2
 from tqdm import tqdm
 import logging
 from utils.path_utils import ensure_long_path
-from image_preprocessor import preprocess_image_for_ocr, cleanup_temp_files
+from image_preprocessor import preprocess_image_for_ocr, cleanup_temp_files, denoise_if_noisy
 from config.settings import min_ocr_confidence, tesseract_config
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -49,27 +49,24 @@ class EnhancedOCRProcessor:
         
     def preprocess_image(self, image_path):
         """Enhanced preprocessing for better OCR"""
-        # Try OpenCV read first
-        img = cv2.imread(str(image_path))
-        if img is None:
+        # Try OpenCV read first, decoding straight to grayscale
+        gray = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             # Fallback: try PIL with Windows long-path support
             try:
                 from PIL import Image as _PILImage
                 pil_img = _PILImage.open(ensure_long_path(image_path))
-                img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+                gray = np.array(pil_img.convert('L'))
             except Exception:
                 return None
-            
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(gray)
+        # Denoise (skipped for clean screenshots)
+        denoised = denoise_if_noisy(gray)
         
-        # Adaptive threshold for better text extraction
+        # Adaptive threshold for better text extraction (in place - no extra full-size buffer)
         binary = cv2.adaptiveThreshold(
             denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
+            cv2.THRESH_BINARY, 11, 2, dst=denoised
         )
         
         # Increase contrast
@@ -13,17 +13,19 @@ import pytesseract
 import cv2
 from PIL import Image
 
+from image_preprocessor import denoise_if_noisy
+
 # Set Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\\Program Files\\Tesseract-OCR\\tesseract.exe'
 
 
 def preprocess_image(image_path: Path):
-    img = cv2.imread(str(image_path))
-    if img is None:
+    gray = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
         return None
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    denoised = cv2.fastNlMeansDenoising(gray)
-    binary = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    denoised = denoise_if_noisy(gray)
+    # Threshold in place; the denoised buffer isn't needed afterwards
+    binary = cv2.adaptiveThreshold(denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2, dst=denoised)
     return Image.fromarray(binary)
 
 
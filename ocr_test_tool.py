@@ -9,11 +9,14 @@ import pytesseract
 from pathlib import Path
 import cv2
 import numpy as np
-from image_preprocessor import preprocess_image_for_ocr, preprocess_messaging_app_screenshot
+from image_preprocessor import preprocess_image_for_ocr, preprocess_messaging_app_screenshot, create_temp_image_path, cleanup_temp_files
 
 # Set Tesseract path
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Large closing kernel for the extreme pass
+EXTREME_CLOSE_KERNEL = np.ones((7, 7), np.uint8)
+
 def test_single_file_ocr(image_path):
     """Test OCR on a single file with different preprocessing methods"""
     
@@ -55,8 +58,7 @@ def test_single_file_ocr(image_path):
             print(f"   Improvement: {avg_conf_military - avg_conf_original:+.1f}%")
             
             # Clean up
-            if os.path.exists(temp_path_military):
-                os.remove(temp_path_military)
+            cleanup_temp_files(temp_path_military, image_path)
         else:
             print("   ❌ Preprocessing failed")
         print()
@@ -78,8 +80,7 @@ def test_single_file_ocr(image_path):
             print(f"   Improvement: {avg_conf_messaging - avg_conf_original:+.1f}%")
             
             # Clean up
-            if os.path.exists(temp_path_messaging):
-                os.remove(temp_path_messaging)
+            cleanup_temp_files(temp_path_messaging, image_path)
         else:
             print("   ❌ Preprocessing failed")
         print()
@@ -96,10 +97,9 @@ def test_single_file_ocr(image_path):
             
             # Extreme Otsu with large morphology
             _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            kernel = np.ones((7, 7), np.uint8)
-            extreme = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+            extreme = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, EXTREME_CLOSE_KERNEL)
             
-            temp_path_extreme = f"temp_extreme_{os.path.basename(image_path)}"
+            temp_path_extreme = create_temp_image_path()
             cv2.imwrite(temp_path_extreme, extreme)
             
             text_extreme = pytesseract.image_to_string(temp_path_extreme, config="--oem 3 --psm 6 -l eng --dpi 300")
@@ -114,8 +114,7 @@ def test_single_file_ocr(image_path):
             print(f"   Improvement: {avg_conf_extreme - avg_conf_original:+.1f}%")
             
             # Clean up
-            if os.path.exists(temp_path_extreme):
-                os.remove(temp_path_extreme)
+            cleanup_temp_files(temp_path_extreme, image_path)
         print()
         
         print("🎯 TEST COMPLETE!")
@@ -1,7 +1,7 @@
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import Paragraph
 from reportlab.lib.units import inch
 from io import BytesIO
@@ -10,17 +10,21 @@ COURT_FILE_NO = "FDSJ-739-2024"
 RESPONDENT_NAME = "CRAIG SCHULZ"
 APPLICANT_NAME = "SONNY RYAN" # Placeholder
 
+# Built once at import; rebuilding the sample stylesheet for every PDF is wasted work
+FORM_BODY_STYLE = ParagraphStyle(
+    'Form81CBody',
+    parent=getSampleStyleSheet()['Normal'],
+    fontName='Helvetica',
+    fontSize=12,
+    leading=18 # 1.5 line spacing
+)
+
 def create_form_81c_pdf(text_content):
     """
     Generates a court-compliant PDF for Form 81C.
     """
     buffer = BytesIO()
     p = canvas.Canvas(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    styleN = styles['Normal']
-    styleN.fontName = 'Helvetica'
-    styleN.fontSize = 12
-    styleN.leading = 18 # 1.5 line spacing
 
     # --- Header ---
     p.setFont('Helvetica-Bold', 12)
@@ -48,7 +52,7 @@ def create_form_81c_pdf(text_content):
 
     # Create Paragraph object to handle text wrapping
     text_lines = text_content.replace('\n', '<br/>')
-    para = Paragraph(text_lines, styleN)
+    para = Paragraph(text_lines, FORM_BODY_STYLE)
     
     # Calculate height and draw
     w, h = para.wrapOn(p, 7 * inch, 5 * inch)
@@ -15,7 +15,9 @@ import json
 import cv2
 from tqdm import tqdm
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from utils.path_utils import ensure_long_path
+from image_preprocessor import denoise_if_noisy
 import pickle
 import os
 
@@ -25,6 +27,14 @@ logger = logging.getLogger(__name__)
 # Set Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Each OCR attempt is a tesseract subprocess, so threads overlap them fine. Run one per core,
+# each on a single OpenMP thread (inherited by the subprocesses), so they don't oversubscribe the CPU.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+OCR_WORKERS = min(4, os.cpu_count() or 1)
+
+# Text cleanup kernel, built once rather than per image
+MORPH_KERNEL = np.ones((1,1), np.uint8)
+
 
 class SmartBatchOCRLearner:
     """OCR processor with adaptive learning from corrections"""
@@ -68,31 +78,29 @@ class SmartBatchOCRLearner:
     def preprocess_image_adaptive(self, image_path):
         """Adaptive preprocessing based on learning"""
         try:
-            # Try OpenCV read first
-            img = cv2.imread(str(image_path))
-            if img is None:
+            # Try OpenCV read first, decoding straight to grayscale
+            gray = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+            if gray is None:
                 # Fallback: try PIL with Windows long-path support
                 from PIL import Image as _PILImage
                 pil_img = _PILImage.open(ensure_long_path(image_path))
-                img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+                gray = np.array(pil_img.convert('L'))
                 
             # Multiple preprocessing approaches
             processed_variants = []
             
             # Variant 1: Standard grayscale + threshold
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
             processed_variants.append(Image.fromarray(binary))
             
             # Variant 2: Denoised + enhanced contrast
-            denoised = cv2.fastNlMeansDenoising(gray)
+            denoised = denoise_if_noisy(gray)
             clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
             enhanced = clahe.apply(denoised)
             processed_variants.append(Image.fromarray(enhanced))
             
             # Variant 3: Morphological operations (for text cleanup)
-            kernel = np.ones((1,1), np.uint8)
-            morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+            morph = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, MORPH_KERNEL)
             processed_variants.append(Image.fromarray(morph))
             
             return processed_variants
@@ -174,56 +182,59 @@ class SmartBatchOCRLearner:
         batch_results = []
         batch_performance = {}
         
-        for img_path in tqdm(image_paths, desc=f"Batch {batch_num}"):
-            try:
-                # Get multiple processed variants
-                processed_images = self.preprocess_image_adaptive(img_path)
+        with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+            for img_path in tqdm(image_paths, desc=f"Batch {batch_num}"):
+                try:
+                    # Get multiple processed variants
+                    processed_images = self.preprocess_image_adaptive(img_path)
                 
-                if not processed_images:
-                    continue
+                    if not processed_images:
+                        continue
                 
-                # Try different OCR configs and pick best result
-                best_text = ""
-                best_confidence = 0
-                best_config = self.ocr_configs[self.current_config_index]
+                    # Try different OCR configs and pick best result
+                    best_text = ""
+                    best_confidence = 0
+                    best_config = self.ocr_configs[self.current_config_index]
                 
-                for config in self.ocr_configs:
-                    for proc_img in processed_images:
-                        text, confidence = self.extract_text_with_confidence(proc_img, config)
-                        
+                    # Run every config/variant pair concurrently; results come back
+                    # in submission order so ties resolve exactly as before
+                    images = [proc_img for _ in self.ocr_configs for proc_img in processed_images]
+                    configs = [config for config in self.ocr_configs for _ in processed_images]
+                    outcomes = executor.map(self.extract_text_with_confidence, images, configs)
+                    for config, (text, confidence) in zip(configs, outcomes):
                         if confidence > best_confidence:
                             best_text = text
                             best_confidence = confidence
                             best_config = config
                 
-                # Detect sender/recipient
-                sender, recipient = self.detect_sender_recipient_smart(best_text, img_path.name)
+                    # Detect sender/recipient
+                    sender, recipient = self.detect_sender_recipient_smart(best_text, img_path.name)
                 
-                # Store result
-                result = {
-                    'filename': img_path.name,
-                    'filepath': str(img_path),
-                    'sender': sender,
-                    'recipient': recipient,
-                    'raw_text': best_text,
-                    'formatted_text': best_text,  # Can be corrected later
-                    'confidence': best_confidence,
-                    'ocr_config': best_config,
-                    'char_count': len(best_text),
-                    'has_sender': sender != "Unknown",
-                    'has_recipient': recipient != "Unknown",
-                    'processed_date': datetime.now().isoformat(),
-                    'batch_num': batch_num
-                }
-                batch_results.append(result)
+                    # Store result
+                    result = {
+                        'filename': img_path.name,
+                        'filepath': str(img_path),
+                        'sender': sender,
+                        'recipient': recipient,
+                        'raw_text': best_text,
+                        'formatted_text': best_text,  # Can be corrected later
+                        'confidence': best_confidence,
+                        'ocr_config': best_config,
+                        'char_count': len(best_text),
+                        'has_sender': sender != "Unknown",
+                        'has_recipient': recipient != "Unknown",
+                        'processed_date': datetime.now().isoformat(),
+                        'batch_num': batch_num
+                    }
+                    batch_results.append(result)
                 
-                # Track config performance
-                if best_config not in batch_performance:
-                    batch_performance[best_config] = []
-                batch_performance[best_config].append(best_confidence)
+                    # Track config performance
+                    if best_config not in batch_performance:
+                        batch_performance[best_config] = []
+                    batch_performance[best_config].append(best_confidence)
                 
-            except Exception as e:
-                logger.error(f"Error processing {img_path}: {e}")
+                except Exception as e:
+                    logger.error(f"Error processing {img_path}: {e}")
         
         # Update learning data with batch performance
         for config, confidences in batch_performance.items():
@@ -15,10 +15,14 @@ from datetime import datetime
 import hashlib
 import re
 from pathlib import Path
+from image_preprocessor import denoise_if_noisy
 
 # Configure Tesseract
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Gentle sharpening kernel, built once rather than per image
+SHARPEN_KERNEL = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
+
 class SmartOCRProcessor:
     def __init__(self):
         self.setup_logging()
@@ -55,15 +59,14 @@ class SmartOCRProcessor:
             else:
                 gray = image.copy()
             
-            # Very gentle noise reduction
-            denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+            # Very gentle noise reduction (skipped for clean screenshots)
+            denoised = denoise_if_noisy(gray, None, 10, 7, 21)
             
             # Slight contrast enhancement only
             enhanced = cv2.convertScaleAbs(denoised, alpha=1.1, beta=5)
             
-            # Gentle sharpening kernel
-            kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
-            sharpened = cv2.filter2D(enhanced, -1, kernel)
+            # Gentle sharpening
+            sharpened = cv2.filter2D(enhanced, -1, SHARPEN_KERNEL)
             
             return sharpened
             
@@ -4,38 +4,22 @@
 
 import streamlit as st
 import hashlib
-import time
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd 
 
 # --- CORE INTEGRITY & STORAGE FUNCTIONS (DEMO MODE) ---
 
+HASH_CHUNK_SIZE = 1 << 22  # 4 MiB slices keep hashlib in C (and off the GIL) for longer per call
+HASH_WORKERS = 8  # hashlib releases the GIL, so uploads hash in parallel
+
 def calculate_sha256_of_uploaded_file(uploaded_file):
-    """Calculates the SHA-256 hash of an uploaded file without saving it permanently."""
-    temp_dir = tempfile.gettempdir()
-    temp_file_path = os.path.join(temp_dir, uploaded_file.name + str(time.time()))
-    calculated_hash = None
-    
-    try:
-        with open(temp_file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer()) 
-            
-        hash_sha256 = hashlib.sha256()
-        with open(temp_file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-            
-        calculated_hash = hash_sha256.hexdigest()
-        
-    except Exception as e:
-        st.error(f"Integrity Engine Error during Hashing: {e}")
-        
-    finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-
-    return calculated_hash
+    """Calculates the SHA-256 hash of an uploaded file directly from its in-memory buffer. Makes no Streamlit calls, so it is safe in worker threads."""
+    hash_sha256 = hashlib.sha256()
+    buffer = memoryview(uploaded_file.getbuffer())
+    for offset in range(0, len(buffer), HASH_CHUNK_SIZE):
+        hash_sha256.update(buffer[offset:offset + HASH_CHUNK_SIZE])
+    return hash_sha256.hexdigest()
 
 def process_and_log_evidence_mock(uploaded_file, file_hash):
     """Mocks the evidence logging process for the demo."""
@@ -81,19 +65,27 @@ def upload_evidence_tab():
             with st.spinner("Calculating Integrity Fingerprints..."):
                 results_list = []
                 
-                for file in uploaded_files:
-                    st.write(f"Processing: **{file.name}**...")
-                    try:
-                        hash_value = calculate_sha256_of_uploaded_file(file)
-                        
-                        if hash_value:
-                            status_message, data = process_and_log_evidence_mock(file, hash_value)
-                            results_list.append(data)
-                        else:
-                            st.warning(f"Could not calculate hash for {file.name}.")
-
-                    except Exception as e:
-                        st.error(f"An error occurred while processing {file.name}: {e}")
+                # Hash every file concurrently; Streamlit output stays on this (the script) thread
+                with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+                    hash_futures = [executor.submit(calculate_sha256_of_uploaded_file, file) for file in uploaded_files]
+
+                    for file, hash_future in zip(uploaded_files, hash_futures):
+                        st.write(f"Processing: **{file.name}**...")
+                        try:
+                            hash_value = hash_future.result()
+                        except Exception as e:
+                            st.error(f"Integrity Engine Error during Hashing: {e}")
+                            hash_value = None
+
+                        try:
+                            if hash_value:
+                                status_message, data = process_and_log_evidence_mock(file, hash_value)
+                                results_list.append(data)
+                            else:
+                                st.warning(f"Could not calculate hash for {file.name}.")
+
+                        except Exception as e:
+                            st.error(f"An error occurred while processing {file.name}: {e}")
 
             if results_list:
                 st.success("Evidence Processing Complete!")